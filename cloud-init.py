@@ -1,25 +1,159 @@
 import base64
-import copy
+import functools
 import getpass
 import glob
-import json
 import os
 import random
 import re
+import secrets
 import string
 import sys
-import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+import httpx
+
+try:
+    # orjson parses the API's raw response bytes considerably faster:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
 start = time.time()
 
 URL_DATACENTERS = "https://api.ionos.com/cloudapi/v6/datacenters"
 
+# Matches the "{{ <key> }}" variables of the JSON config files:
+PLACEHOLDER = re.compile(r"\{\{ ([^{}\s]+) \}\}")
+
+# Valid answers to the "Are you sure...?" questions of math_func():
+ANSWER_HELP = re.compile("^(H|h)(elp)?$")
+ANSWER_YES = re.compile("^(Y|y)(es)?$")
+ANSWER_NO = re.compile("^(N|n)(o)?$")
+
+# IONOS only accepts Latin letters and digits in an "imagePassword":
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
+
+# Timeouts in seconds (3.05 to connect, 30 otherwise) of every API request:
+TIMEOUT = httpx.Timeout(30, connect=3.05)
+
+# Maximum number of concurrent API requests:
+MAX_CONNECTIONS = 32
+
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport which also retries requests answered with a transient error.
+
+    Like urllib3's `Retry`, only idempotent requests are retried, with an
+    exponential backoff (or the server's "Retry-After", if given).
+    """
+
+    IDEMPOTENT_METHODS = {"DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"}
+
+    def __init__(
+        self, retries=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504), **kw
+    ):
+        # `retries` of httpx itself only cover failed connection attempts:
+        super().__init__(retries=retries, **kw)
+        self.status_retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+
+    def handle_request(self, request):
+        response = super().handle_request(request)
+        for attempt in range(self.status_retries):
+            if (
+                request.method not in self.IDEMPOTENT_METHODS
+                or response.status_code not in self.status_forcelist
+            ):
+                break
+            retry_after = response.headers.get("Retry-After", "")
+            response.close()
+            if retry_after.isdigit():
+                time.sleep(int(retry_after))
+            else:
+                time.sleep(self.backoff_factor * 2**attempt)
+            response = super().handle_request(request)
+        return response
+
+
+# Reuse one HTTP/2 connection for all API requests, instead of doing a full
+# TCP+TLS handshake on every single call; concurrent requests are multiplexed:
+# (The limits are those of the transport, as a custom one is given.)
+CLIENT = httpx.Client(
+    timeout=TIMEOUT,
+    transport=RetryTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS, max_keepalive_connections=16
+        ),
+    ),
+)
+
+# {(api_url, auth_headers items): {name: href}} of the IONOS API, see lookup_href():
+LIST_INDEXES = {}
+
+# {(server_name, type): {name: index}} of the JSON config files, see component_index():
+COMPONENT_INDEXES = {}
+
+# Shared by all concurrent API requests, which are then multiplexed by CLIENT:
+POOL = ThreadPoolExecutor(max_workers=MAX_CONNECTIONS)
+
+
+def get_json(url, auth_headers, params=None):
+    """Gets a server's, component's or collection's JSON from the IONOS API.
+
+    Args:
+        url: Unique URL (href) of the server, component or collection.
+        auth_headers:
+        params: Optional query parameters, e.g., {"depth": 2}.
+
+    Returns:
+        Returns the parsed JSON response.
+    """
+    return loads(CLIENT.get(url, params=params, headers=auth_headers).content)
+
+
+def list_index(api_url, auth_headers):
+    """Maps the names of all items of a collection to their unique hrefs.
+
+    Args:
+        api_url: Datacenter URL (in case of server) or server URL (otherwise).
+        auth_headers:
+
+    Returns:
+        Returns a dict of {name: href}, fetched with a single request.
+    """
+    index = {}
+    # depth=2 inlines the items' properties, so no GET per item is needed:
+    items = get_json(api_url, auth_headers, params={"depth": 2})["items"]
+    for item in items:
+        index.setdefault(item["properties"]["name"], item["href"])
+    return index
+
+
+def lookup_href(name, api_url, auth_headers):
+    """Looks up a server's or component's unique href in the index of all items.
+
+    Args:
+        name: Either a server's or a component's name.
+        api_url: Datacenter URL (in case of server) or server URL (otherwise).
+        auth_headers:
+
+    Returns:
+        Returns unique href of server or component, or None if it does not exist.
+    """
+    key = (api_url, tuple(sorted(auth_headers.items())))
+    index = LIST_INDEXES.get(key)
+    if index is None or name not in index:
+        # Not cached yet, or the cached index may predate the item's creation,
+        # so (re)fetch this one collection only:
+        index = LIST_INDEXES[key] = list_index(api_url, auth_headers)
+    return index.get(name)
+
 
 def name_to_href(name, api_url, auth_headers):
-    """Runs through all items to get a server's or component's unique href.
+    """Gets a server's or component's unique href, see lookup_href().
 
     Args:
         name: Either a server's or a component's name.
@@ -32,13 +166,26 @@ def name_to_href(name, api_url, auth_headers):
     Raises:
         exit(1) if server or component does not exist.
     """
-    items = json.loads(requests.get(api_url, headers=auth_headers).text)["items"]
-    for item in items:
-        href = json.loads(requests.get(item["href"], headers=auth_headers).text)
-        if href["properties"]["name"] == name:
-            return href["href"]
-    print(f"??? {name} does not exist?")
-    exit(1)
+    href = lookup_href(name, api_url, auth_headers)
+    if href is None:
+        print(f"??? {name} does not exist?")
+        exit(1)
+    return href
+
+
+def servers_url(auth_headers):
+    """Gets the URL of all servers of the DATACENTER, a.k.a. URL_SERVERS.
+
+    Args:
+        auth_headers:
+
+    Returns:
+        Returns name_to_href(DATACENTER, ...) + "/servers" (cached by lookup_href()).
+    """
+    return (
+        name_to_href(os.environ.get("DATACENTER"), URL_DATACENTERS, auth_headers)
+        + "/servers"
+    )
 
 
 def json_file_open(file_name):
@@ -50,10 +197,8 @@ def json_file_open(file_name):
     Returns:
         Returns file's contents as JSON dictionary.
     """
-    json_obj = {}
     with open(file_name) as json_file:
         text = json_file.read()
-        json_obj = json.loads(text)
         if "LOCATION" in os.environ:
             with open(
                 "/datacenters/"
@@ -62,11 +207,13 @@ def json_file_open(file_name):
                 + os.environ.get("LOCATION")
                 + ".json"
             ) as config_file:
-                for k, v in json.loads(config_file.read()).items():
-                    json_obj = json.loads(
-                        json.dumps(json_obj).replace("{{ " + k + " }}", v)
-                    )
-    return json_obj
+                config = loads(config_file.read())
+            # Substitute all "{{ <key> }}" in one pass, before parsing the JSON;
+            # unknown keys are left untouched:
+            text = PLACEHOLDER.sub(
+                lambda match: config.get(match.group(1), match.group(0)), text
+            )
+    return loads(text)
 
 
 def globbing(path):
@@ -110,6 +257,24 @@ def header_function(username, password, contract_nr):
     return headers
 
 
+def state(href, auth_headers):
+    """Gets the current state of a server or component.
+
+    Args:
+        href: Unique URL of a server or component.
+        auth_headers:
+
+    Returns:
+        Returns the state, e.g., "AVAILABLE", or "BUSY" if there is none (yet).
+    """
+    try:
+        return get_json(href, auth_headers)["metadata"]["state"]
+    except (KeyError, ValueError, httpx.HTTPError):
+        # E.g., an error body without "metadata" (or no JSON at all),
+        # or retries/timeouts exhausted.
+        return "BUSY"
+
+
 def all_available(hrefs, auth_headers):
     """Blocks until a (set of) server(s) is available.
 
@@ -120,66 +285,78 @@ def all_available(hrefs, auth_headers):
     Raises:
         exit(1) if the limit of requests (timeout) is reached.
     """
-    all_available = False
+    pending = set(hrefs)
     status_finished = "AVAILABLE"
     limit = 120
-    while not all_available:
-        all_available = True
+    # Poll all pending hrefs concurrently, sharing CLIENT's connection,
+    # and stop polling an href once it has been available:
+    while pending:
         if limit == 0:
             print("!!! Limit reached!", flush=True)
             exit(1)
         print("... Server BUSY...", flush=True)
         time.sleep(5)
-        for href in hrefs:
-            try:
-                status = json.loads(requests.get(href, headers=auth_headers).text)[
-                    "metadata"
-                ]["state"]
-            except KeyError:
-                status = "BUSY"
-            if status != status_finished:
-                all_available = False
-                break
+        polled = list(pending)
+        states = POOL.map(lambda href: state(href, auth_headers), polled)
+        for href, status in zip(polled, states):
+            if status == status_finished:
+                pending.discard(href)
         limit -= 1
 
 
-def server_exists(server_name, api_url, auth_headers):
+def resolve_server(server_name, api_url, auth_headers):
     """Checks if a server is already existing in the datacenter.
 
     Args:
         server_name: Name of the server.
-        api_url: Unique URL (href) of the server.
+        api_url: name_to_href(...) + "/servers" a.k.a. URL_SERVERS.
         auth_headers:
 
     Returns:
-        Returns True if server exists. Returns False if not.
+        Returns the server's unique href if it exists. Returns None if not.
     """
-    items = json.loads(requests.get(api_url, headers=auth_headers).text)["items"]
-    for item in items:
-        server = json.loads(requests.get(item["href"], headers=auth_headers).text)
-        if server["properties"]["name"] == server_name:
-            print(f"... Server {server_name} exists.")
-            return True
-    print(f"... Server {server_name} does not exist.")
-    return False
+    href = lookup_href(server_name, api_url, auth_headers)
+    if href is None:
+        print(f"... Server {server_name} does not exist.")
+    else:
+        print(f"... Server {server_name} exists.")
+    return href
 
 
 def user_data(dir, file_name):
     """Generates cloud-config userData from template.
 
+    The result is cached per template and its modification time only, so edits
+    to the `{{ included }}` files are not seen within the same process.
+
+    Args:
+        dir: Directory containing cloud-configs (templates).
+        file_name: Name of the cloud-config file to be parsed.
+
+    Returns:
+        Base64 encoded cloud-config userData.
+    """
+    # Note that `<dir>` is supposed to end with a `/`.
+    mtime = os.path.getmtime(f"{dir}{file_name}")
+    return cached_user_data(dir, file_name, mtime)
+
+
+@functools.lru_cache(maxsize=64)
+def cached_user_data(dir, file_name, mtime):
+    """Generates cloud-config userData from template, see user_data().
+
     Args:
         dir: Directory containing cloud-configs (templates).
         file_name: Name of the cloud-config file to be parsed.
+        mtime: Modification time of the template, part of the cache key
+            (unlike the included files and DATACENTER's "includes" directory).
 
     Returns:
         Base64 encoded cloud-config userData.
     """
-    # creating a temporary file because docker container has a read-only filesystem:
-    temp_braces = tempfile.TemporaryFile(mode="r+")
+    parts = []
     with open(f"{dir}{file_name}") as fp:
-        # Note that `<dir>` is supposed to end with a `/`.
-        braces = fp.readlines()
-        for line in braces:
+        for line in fp:
             if line.startswith("{{"):
                 includes_dir = (
                     "/datacenters/" + os.environ.get("DATACENTER") + "/includes/"
@@ -187,20 +364,34 @@ def user_data(dir, file_name):
                 includes_file = line[2:].split("}}")[0].strip()
                 if not os.path.isfile(includes_dir + includes_file):
                     includes_dir = "/datacenters/includes/"
-                with open(includes_dir + includes_file) as fp:
-                    temp_braces.write(fp.read())
+                with open(includes_dir + includes_file) as include:
+                    parts.append(include.read())
             else:
-                temp_braces.write(line)
-    temp_braces.seek(0)
-    server_yaml = temp_braces.read()
+                parts.append(line)
+    server_yaml = "".join(parts)
     message_bytes = server_yaml.encode("ascii")
     base64_bytes = base64.b64encode(message_bytes)
     base64_message = base64_bytes.decode("ascii")
     return base64_message
 
 
+def random_password(length=32):
+    """Generates a random "imagePassword" using a cryptographically secure RNG.
+
+    Args:
+        length: Number of characters.
+
+    Returns:
+        Returns the password, which is not printed anywhere.
+    """
+    return "".join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
 def create_single(server_name, json_files, api_url, auth_headers):
-    """Creates a single server of the datacenter.
+    """Creates a single server of the datacenter, with all of its components.
+
+    The server, its volumes, NICs and firewall rules are created with a single
+    (composite) request.
 
     Args:
         server_name: Name of the server to create.
@@ -210,47 +401,79 @@ def create_single(server_name, json_files, api_url, auth_headers):
 
     Returns:
         Returns the href (unique server id) of the server created.
+
+    Raises:
+        exit(1) if the server could not be created.
     """
     print(f"+++ Creating server: {server_name}")
-    server = json_files[server_name + ".json"]["server"]
+    json_file = json_files[server_name + ".json"]
+    server = json_file["server"]
+
+    # Also create the components, which can otherwise be attached one by one:
+    volume_items = server["entities"]["volumes"]["items"] + json_file["volumes"]
+    nic_items = server["entities"]["nics"]["items"] + json_file["nics"]
+
+    # Only the volumes' "properties" get modified below, therefore:
+    # copy just those - so that the original json_files stays intact for later usage.
+    volumes = [{**item, "properties": {**item["properties"]}} for item in volume_items]
 
     # "firewallrules" is an unrecognized field, therefore:
-    # deepcopy the server's JSON and temporarily delete the "firewallrules"
-    # - so that the original json_files stays intact for later usage...
-    server_deepcopy = copy.deepcopy(server)
-    for item in server_deepcopy["entities"]["nics"]["items"]:
+    # nest the rules as the API expects.
+    nics = []
+    for item in nic_items:
+        nic = {k: v for k, v in item.items() if k != "firewallrules"}
         if "firewallrules" in item:
-            del item["firewallrules"]
+            nic["entities"] = {
+                **item.get("entities", {}),
+                "firewallrules": {"items": item["firewallrules"]},
+            }
+        nics.append(nic)
+
+    server_payload = {
+        **server,
+        "entities": {
+            **server["entities"],
+            "volumes": {**server["entities"]["volumes"], "items": volumes},
+            "nics": {**server["entities"]["nics"], "items": nics},
+        },
+    }
 
     # "imagePassword" MUST NOT be empty for IONOS public images.
     # Generate random password if "imagePassword" is null in JSON config,
     # but do not print it, effectively prohibiting 'root' user log in.
-    try:
-        for item in server_deepcopy["entities"]["volumes"]["items"]:
-            if item["properties"]["imagePassword"] is None:
-                item["properties"]["imagePassword"] = "".join(
-                    random.choices(
-                        string.ascii_uppercase + string.ascii_lowercase + string.digits,
-                        k=32,
-                    )
-                )
-    except KeyError:
-        pass
+    # Volumes without an "imagePassword" key (e.g., data drives) are left alone.
+    for item in volumes:
+        properties = item["properties"]
+        if "imagePassword" in properties and properties["imagePassword"] is None:
+            properties["imagePassword"] = random_password()
 
     dir = "/datacenters/" + os.environ.get("DATACENTER") + "/cloud-configs/"
-    for item in server_deepcopy["entities"]["volumes"]["items"]:
+    cloud_configs = set(os.listdir(dir))
+    for item in volumes:
         name = item["properties"]["name"]
         file_name = f"{name}.yaml"
-        if file_name in os.listdir(dir) and "-boot" in name:
+        if file_name in cloud_configs and name.endswith("-boot"):
             item["properties"]["userData"] = user_data(dir, file_name)
             # Note that `<name>` is supposed to be `<server_name>-boot`.
 
-    res = json.loads(
-        requests.post(api_url, json=server_deepcopy, headers=auth_headers).text
-    )
+    res = loads(CLIENT.post(api_url, json=server_payload, headers=auth_headers).content)
     print(res)
+    if "href" not in res:
+        print(f"!!! Server {server_name} could not be created!", flush=True)
+        exit(1)
     href = res["href"]
     all_available([href], auth_headers)
+    # Make the (formerly attached) volume a boot device if name ends with "-boot":
+    for item in json_file["volumes"]:
+        name = item["properties"]["name"]
+        if name.endswith("-boot"):
+            volume_href = name_to_href(name, href + "/volumes", auth_headers)
+            CLIENT.patch(
+                href,
+                json={"bootVolume": {"id": volume_href.rsplit("/", 1)[-1]}},
+                headers=auth_headers,
+            )
+            all_available([href], auth_headers)
     return href
 
 
@@ -263,7 +486,7 @@ def attach(type, json_files, api_url, auth_headers):
         api_url: Unique URL (href) of the server.
         auth_headers:
     """
-    server = json.loads(requests.get(api_url, headers=auth_headers).text)
+    server = get_json(api_url, auth_headers)
     server_name = server["properties"]["name"]
     for t in json_files[server_name + ".json"][type]:
         attach_single(
@@ -276,6 +499,26 @@ def attach(type, json_files, api_url, auth_headers):
         )
 
 
+def component_index(server_name, type, json_files):
+    """Maps the names of a server's components of <type> to their list index.
+
+    Args:
+        server_name: Name of the server.
+        type: Either "volumes" or "nics".
+        json_files: Contains all server specifications.
+
+    Returns:
+        Returns a dict of {name: index}, built only once per server and <type>.
+    """
+    key = (server_name, type)
+    if key not in COMPONENT_INDEXES:
+        index = {}
+        for i, t in enumerate(json_files[server_name + ".json"][type]):
+            index.setdefault(t["properties"]["name"], i)
+        COMPONENT_INDEXES[key] = index
+    return COMPONENT_INDEXES[key]
+
+
 def attach_single(href, server_name, name, type, json_files, auth_headers):
     """Creates and attaches one component of <type> to an existing server.
 
@@ -290,19 +533,15 @@ def attach_single(href, server_name, name, type, json_files, auth_headers):
     Raises:
         exit(1) if the server does not exist or the component's name is wrong.
     """
-    URL_SERVERS = (
-        name_to_href(os.environ.get("DATACENTER"), URL_DATACENTERS, auth_headers)
-        + "/servers"
-    )
-    if not server_exists(server_name, URL_SERVERS, auth_headers):
+    if resolve_server(server_name, servers_url(auth_headers), auth_headers) is None:
         exit(1)
     json_file = json_files[server_name + ".json"]
-    components = [t["properties"]["name"] for t in json_file[type]]
-    if name not in components:
+    idx = component_index(server_name, type, json_files).get(name)
+    if idx is None:
+        components = list(component_index(server_name, type, json_files))
         print(f"??? {name} not in {components}?")
         exit(1)
     url_type = href + "/" + type
-    idx = components.index(name)
 
     # "imagePassword" MUST NOT be empty for IONOS public images.
     # Generate random password if "imagePassword" is null in JSON config,
@@ -310,39 +549,36 @@ def attach_single(href, server_name, name, type, json_files, auth_headers):
     try:
         if type == "volumes":
             if json_file[type][idx]["properties"]["imagePassword"] is None:
-                json_file[type][idx]["properties"]["imagePassword"] = "".join(
-                    random.choices(
-                        string.ascii_uppercase + string.ascii_lowercase + string.digits,
-                        k=32,
-                    )
-                )
+                json_file[type][idx]["properties"]["imagePassword"] = random_password()
     except KeyError:
         pass
 
     dir = "/datacenters/" + os.environ.get("DATACENTER") + "/cloud-configs/"
     file_name = f"{server_name}-boot.yaml"
-    if type == "volumes" and file_name in os.listdir(dir) and "-boot" in name:
+    if type == "volumes" and name.endswith("-boot") and file_name in os.listdir(dir):
         json_file[type][idx]["properties"]["userData"] = user_data(dir, file_name)
     print("+++ Attaching " + type + "." + name + " to " + server_name + ".")
-    component = json.loads(
-        requests.post(
+    component = loads(
+        CLIENT.post(
             url_type,
             json={"properties": json_file[type][idx]["properties"]},
             headers=auth_headers,
-        ).text
+        ).content
     )
 
     all_available([href], auth_headers)
     # Make newly attached volume a boot device if name ends with "-boot":
     if type == "volumes" and component["properties"]["name"].endswith("-boot"):
-        requests.patch(
-            href, json={"bootVolume": {"id": component["id"]}}, headers=auth_headers
+        CLIENT.patch(
+            href,
+            json={"bootVolume": {"id": component["id"]}},
+            headers=auth_headers,
         )
     all_available([href], auth_headers)
 
 
 def create(server_name, json_files, api_url, auth_headers):
-    """Creates a server with all components, by calling create_single()/attach().
+    """Creates a server with all components, by calling create_single().
 
     Args:
         server_name: Name of the server.
@@ -351,14 +587,11 @@ def create(server_name, json_files, api_url, auth_headers):
         auth_headers:
 
     Raises:
-        exit(1) if the server already exists.
+        exit(1) if the server already exists or cannot be created.
     """
-    if server_exists(server_name, api_url, auth_headers):
+    if resolve_server(server_name, api_url, auth_headers) is not None:
         exit(1)
-    href = create_single(server_name, json_files, api_url, auth_headers)
-    attach("volumes", json_files, href, auth_headers)
-    attach("nics", json_files, href, auth_headers)
-    fwrules_create(server_name, json_files, auth_headers)
+    create_single(server_name, json_files, api_url, auth_headers)
 
 
 def delete_single(server_object, auth_headers):
@@ -369,7 +602,7 @@ def delete_single(server_object, auth_headers):
         auth_headers:
     """
     print("--- Deleting server: " + server_object["properties"]["name"])
-    requests.delete(server_object["href"], headers=auth_headers)
+    CLIENT.delete(server_object["href"], headers=auth_headers)
 
 
 def detach(type, json_files, api_url, auth_headers):
@@ -381,15 +614,13 @@ def detach(type, json_files, api_url, auth_headers):
         api_url: Unique URL (href) of the server.
         auth_headers:
     """
-    server = json.loads(requests.get(api_url, headers=auth_headers).text)
+    server = get_json(api_url, auth_headers)
     server_name = server["properties"]["name"]
     url_type = api_url + "/" + type
-    items = json.loads(requests.get(url_type, headers=auth_headers).text)["items"]
+    items = get_json(url_type, auth_headers, params={"depth": 2})["items"]
     for item in items:
         item_href = item["href"]
-        item_name = json.loads(requests.get(item_href, headers=auth_headers).text)[
-            "properties"
-        ]["name"]
+        item_name = item["properties"]["name"]
         detach_single(item_href, server_name, item_name, type, json_files, auth_headers)
 
 
@@ -407,11 +638,8 @@ def detach_single(href, server_name, name, type, json_files, auth_headers):
     Raises:
         exit(1) if the server does not exist or the component's name is wrong.
     """
-    URL_SERVERS = (
-        name_to_href(os.environ.get("DATACENTER"), URL_DATACENTERS, auth_headers)
-        + "/servers"
-    )
-    if not server_exists(server_name, URL_SERVERS, auth_headers):
+    server_href = resolve_server(server_name, servers_url(auth_headers), auth_headers)
+    if server_href is None:
         exit(1)
     json_file = json_files[server_name + ".json"]
     components = [
@@ -422,8 +650,7 @@ def detach_single(href, server_name, name, type, json_files, auth_headers):
         print(f"??? {name} not in {components}?")
         exit(1)
     print("--- Detaching " + type + "." + name + " from " + server_name + ".")
-    requests.delete(href, headers=auth_headers)
-    server_href = name_to_href(server_name, URL_SERVERS, auth_headers)
+    CLIENT.delete(href, headers=auth_headers)
     all_available([server_href], auth_headers)
 
 
@@ -439,10 +666,10 @@ def delete(server_name, json_files, api_url, auth_headers):
     Raises:
         exit(1) if the server does not already exist.
     """
-    if not server_exists(server_name, api_url, auth_headers):
+    server_href = resolve_server(server_name, api_url, auth_headers)
+    if server_href is None:
         exit(1)
-    server_href = name_to_href(server_name, api_url, auth_headers)
-    server_object = json.loads(requests.get(server_href, headers=auth_headers).text)
+    server_object = get_json(server_href, auth_headers)
     all_available([server_href], auth_headers)
     detach("nics", json_files, server_href, auth_headers)
     detach("volumes", json_files, server_href, auth_headers)
@@ -462,11 +689,8 @@ def fwrules_create_single(name, server_name, nic_name, json_files, auth_headers)
     Raises:
         exit(1) if the server does not exist or the rule's name is wrong.
     """
-    URL_SERVERS = (
-        name_to_href(os.environ.get("DATACENTER"), URL_DATACENTERS, auth_headers)
-        + "/servers"
-    )
-    if not server_exists(server_name, URL_SERVERS, auth_headers):
+    server_href = resolve_server(server_name, servers_url(auth_headers), auth_headers)
+    if server_href is None:
         exit(1)
     nics = (
         json_files[server_name + ".json"]["nics"]
@@ -484,9 +708,7 @@ def fwrules_create_single(name, server_name, nic_name, json_files, auth_headers)
                 exit(1)
             for rule in rules:
                 if rule["properties"]["name"] == name:
-                    nic_href = (
-                        name_to_href(server_name, URL_SERVERS, auth_headers) + "/nics"
-                    )
+                    nic_href = server_href + "/nics"
                     fw_href = (
                         name_to_href(nic_name, nic_href, auth_headers)
                         + "/firewallrules"
@@ -495,8 +717,7 @@ def fwrules_create_single(name, server_name, nic_name, json_files, auth_headers)
                         f"+++ Creating firewallrules.{name} "
                         f"on nics.{nic_name} of server.{server_name}."
                     )
-                    requests.post(fw_href, json=rule, headers=auth_headers)
-                    server_href = name_to_href(server_name, URL_SERVERS, auth_headers)
+                    CLIENT.post(fw_href, json=rule, headers=auth_headers)
                     all_available([server_href], auth_headers)
 
 
@@ -537,20 +758,19 @@ def fwrules_delete_single(api_url, server_name, nic_name, name, auth_headers):
     Raises:
         exit(1) if the server does not exist.
     """
-    if not server_exists(server_name, api_url, auth_headers):
+    server_href = resolve_server(server_name, api_url, auth_headers)
+    if server_href is None:
         exit(1)
-    nic_href = name_to_href(server_name, api_url, auth_headers) + "/nics"
+    nic_href = server_href + "/nics"
     fw_href = name_to_href(nic_name, nic_href, auth_headers) + "/firewallrules"
-    fw_rules = json.loads(requests.get(fw_href, headers=auth_headers).text)
+    fw_rules = get_json(fw_href, auth_headers, params={"depth": 2})
     for item in fw_rules["items"]:
-        fw_rule = json.loads(requests.get(item["href"], headers=auth_headers).text)
-        if fw_rule["properties"]["name"] == name:
+        if item["properties"]["name"] == name:
             print(
                 f"--- Deleting firewallrules.{name} "
                 f"from nics.{nic_name} of server.{server_name}."
             )
-            requests.delete(item["href"], headers=auth_headers)
-    server_href = name_to_href(server_name, api_url, auth_headers)
+            CLIENT.delete(item["href"], headers=auth_headers)
     all_available([server_href], auth_headers)
 
 
@@ -584,76 +804,78 @@ def math_func(type=None):
     Args:
         type: One of "VOLUME", "NIC", "FIREWALL" or None, i.e., the whole "SERVER".
     """
-    input_val = None
-    if type:
-        if type == "DATACENTER":
-            input_val = (
-                input(
-                    "Are you sure you want to delete the datacenter "
-                    f"{os.environ['DATACENTER']}? [y/N]: "
+    while True:
+        input_val = None
+        if type:
+            if type == "DATACENTER":
+                input_val = (
+                    input(
+                        "Are you sure you want to delete the datacenter "
+                        f"{os.environ['DATACENTER']}? [y/N]: "
+                    )
+                    or "N"
+                )
+            else:
+                input_val = (
+                    input(
+                        f'Are you sure you want to delete {type}="{os.environ[type]}" '
+                        f"from server {os.environ['SERVER']}? [y/N]: "
+                    )
+                    or "N"
                 )
-                or "N"
-            )
         else:
             input_val = (
                 input(
-                    f'Are you sure you want to delete {type}="{os.environ[type]}" '
-                    f"from server {os.environ['SERVER']}? [y/N]: "
+                    "Are you sure you want to delete the server "
+                    f"{os.environ['SERVER']}? [y/N]: "
                 )
                 or "N"
             )
-    else:
-        input_val = (
-            input(
-                "Are you sure you want to delete the server "
-                f"{os.environ['SERVER']}? [y/N]: "
-            )
-            or "N"
-        )
-    if re.match("^(H|h)(elp)?$", input_val):
-        print("There is no help.")
-        print("Try again.")
-        math_func(type)
-    elif re.match("^(Y|y)(es)?$", input_val):
-        string_val = [
-            "zero",
-            "one",
-            "two",
-            "three",
-            "four",
-            "five",
-            "six",
-            "seven",
-            "eight",
-            "nine",
-        ]
-        left = random.randint(0, 9)
-        right = random.randint(0, 9)
-        left_str = str(left)
-        right_str = str(right)
-        if random.choice([True, False]):
-            left_str = string_val[left]
-        if random.choice([True, False]):
-            right_str = string_val[right]
-        operator = random.choice(["*", "-", "+"])
-        math_problem = f"What is the result of {left_str} {operator} {right_str}? "
-        result = None
-        if operator == "*":
-            result = left * right
-        elif operator == "-":
-            result = left - right
-        elif operator == "+":
-            result = left + right
-        answer = input(math_problem)
-        if not answer or int(answer) != result:
-            print("Wrong answer...")
+        if ANSWER_HELP.match(input_val):
+            print("There is no help.")
+            print("Try again.")
+            continue
+        elif ANSWER_YES.match(input_val):
+            string_val = [
+                "zero",
+                "one",
+                "two",
+                "three",
+                "four",
+                "five",
+                "six",
+                "seven",
+                "eight",
+                "nine",
+            ]
+            left = random.randint(0, 9)
+            right = random.randint(0, 9)
+            left_str = str(left)
+            right_str = str(right)
+            if random.choice([True, False]):
+                left_str = string_val[left]
+            if random.choice([True, False]):
+                right_str = string_val[right]
+            operator = random.choice(["*", "-", "+"])
+            math_problem = f"What is the result of {left_str} {operator} {right_str}? "
+            result = None
+            if operator == "*":
+                result = left * right
+            elif operator == "-":
+                result = left - right
+            elif operator == "+":
+                result = left + right
+            answer = input(math_problem)
+            if not answer or int(answer) != result:
+                print("Wrong answer...")
+                exit(1)
+            break
+        elif ANSWER_NO.match(input_val):
+            print("Ok, see you next time...")
             exit(1)
-    elif re.match("^(N|n)(o)?$", input_val):
-        print("Ok, see you next time...")
-        exit(1)
-    else:
-        print(f"{input_val} is not a valid answer!")
-        math_func(type)
+        else:
+            print(f"{input_val} is not a valid answer!")
+            continue
 
 
 if __name__ == "__main__":
@@ -673,7 +895,16 @@ if __name__ == "__main__":
         # Check if the requested datacenter is a directory, locally:
         if os.environ.get("DATACENTER") in os.listdir("/datacenters/"):
             path = "/datacenters/" + os.environ["DATACENTER"] + "/*.json"
-            json_files = globbing(path)
+            server = os.environ.get("SERVER", "")
+            server_path = path.replace("*", server)
+            # Only the requested server's config file is needed, but - just like
+            # globbing() - never treat dotfiles like ".de_fra.json" as servers:
+            if server and not server.startswith(".") and os.path.isfile(server_path):
+                json_files = {
+                    os.path.basename(server_path): json_file_open(server_path)
+                }
+            else:
+                json_files = globbing(path)
             server_names = [k.removesuffix(".json") for k in json_files.keys()]
             if "ACTION" not in os.environ:
                 print("Environment variable ACTION should be set.")
@@ -687,10 +918,7 @@ if __name__ == "__main__":
         print("Environment variable DATACENTER should be set.")
         exit(1)
 
-    URL_SERVERS = (
-        name_to_href(os.environ.get("DATACENTER"), URL_DATACENTERS, auth_headers)
-        + "/servers"
-    )
+    URL_SERVERS = servers_url(auth_headers)
 
     if "SERVER" not in os.environ:
         if os.environ["ACTION"] == "create":
@@ -715,13 +943,18 @@ if __name__ == "__main__":
                 f"{arguments} at the same time."
             )
             exit(1)
+        if "FIREWALLRULE" in os.environ:
+            firewallrule_pattern = re.compile(os.environ["FIREWALLRULE"])
         if os.environ["SERVER"] in server_names and os.environ["ACTION"] == "create":
-            if not server_exists(os.environ["SERVER"], URL_SERVERS, auth_headers):
+            server_href = resolve_server(
+                os.environ["SERVER"], URL_SERVERS, auth_headers
+            )
+            if server_href is None:
                 create(os.environ["SERVER"], json_files, URL_SERVERS, auth_headers)
             else:
                 if "VOLUME" in os.environ:
                     attach_single(
-                        name_to_href(os.environ["SERVER"], URL_SERVERS, auth_headers),
+                        server_href,
                         os.environ["SERVER"],
                         os.environ["VOLUME"],
                         "volumes",
@@ -730,7 +963,7 @@ if __name__ == "__main__":
                     )
                 elif "NIC" in os.environ:
                     attach_single(
-                        name_to_href(os.environ["SERVER"], URL_SERVERS, auth_headers),
+                        server_href,
                         os.environ["SERVER"],
                         os.environ["NIC"],
                         "nics",
@@ -751,10 +984,7 @@ if __name__ == "__main__":
                                 for rule in nic["firewallrules"]
                             ]
                             for rule in rules:
-                                matched = re.match(
-                                    os.environ["FIREWALLRULE"],
-                                    rule,
-                                )
+                                matched = firewallrule_pattern.match(rule)
                                 if matched:
                                     fwrules_create_single(
                                         rule,
@@ -766,12 +996,12 @@ if __name__ == "__main__":
                 else:
                     exit(1)
         elif os.environ["SERVER"] in server_names and os.environ["ACTION"] == "delete":
-            if server_exists(os.environ["SERVER"], URL_SERVERS, auth_headers):
+            server_href = resolve_server(
+                os.environ["SERVER"], URL_SERVERS, auth_headers
+            )
+            if server_href is not None:
                 if "VOLUME" in os.environ:
                     math_func("VOLUME")
-                    server_href = name_to_href(
-                        os.environ["SERVER"], URL_SERVERS, auth_headers
-                    )
                     item_href = name_to_href(
                         os.environ["VOLUME"],
                         server_href + "/" + "volumes",
@@ -787,9 +1017,6 @@ if __name__ == "__main__":
                     )
                 elif "NIC" in os.environ:
                     math_func("NIC")
-                    server_href = name_to_href(
-                        os.environ["SERVER"], URL_SERVERS, auth_headers
-                    )
                     item_href = name_to_href(
                         os.environ["NIC"], server_href + "/" + "nics", auth_headers
                     )
@@ -816,10 +1043,7 @@ if __name__ == "__main__":
                                 for firewallrule in nic["firewallrules"]
                             ]
                             for rule in rules:
-                                matched = re.match(
-                                    os.environ["FIREWALLRULE"],
-                                    rule,
-                                )
+                                matched = firewallrule_pattern.match(rule)
                                 if matched:
                                     fwrules_delete_single(
                                         URL_SERVERS,